@@ -1,7 +1,7 @@
 # Copyright (c) 2025 Loong Ma
 # SPDX-License-Identifier: MIT
 
-from .cli import app
+from .cli import main
 
 if __name__ == "__main__":
-    app()
+    main()
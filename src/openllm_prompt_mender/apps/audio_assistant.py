@@ -3,17 +3,43 @@
 
 from __future__ import annotations
 
+import math
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 import dspy
 from dotenv import load_dotenv
 
-load_dotenv()
+from openllm_prompt_mender.utils.batch_utils import build_batch_scorer
+from openllm_prompt_mender.utils.eval_utils import DEFAULT_ASYNC_MAX_WORKERS, DEFAULT_NUM_THREADS
+from openllm_prompt_mender.utils.judge_cache import (
+    JudgeCache,
+    VerdictStore,
+    block_hashes,
+    delta_prefix,
+    judge_fingerprint,
+    split_blocks,
+)
 
 DEFAULT_MAIN_MODEL = "ollama/Qwen3-4B-2507-RL-global-285-0123-fp16"
 DEFAULT_JUDGE_MODEL = "openai/gpt-5-mini"
+# gpt-5-mini only accepts its default temperature, so the default judge is not cacheable.
+DEFAULT_JUDGE_TEMPERATURE: float | None = None
 DEFAULT_MAX_TOKENS = 10240
+DEFAULT_INCR_THRESHOLD = 0.8
+
+SCORE_FIELDS = (
+    "general_score",
+    "tone_score",
+    "hierarchy_score",
+    "scenario_alignment_score",
+    "audience_match_score",
+    "language_consistency_score",
+    "language_appropriateness_score",
+)
+# Equal weights today; kept as a vector so criteria can be re-weighted without touching the metric.
+_SCORE_WEIGHTS = (1.0 / len(SCORE_FIELDS),) * len(SCORE_FIELDS)
 
 
 class AnalyzeRequirement(dspy.Signature):
@@ -49,6 +75,9 @@ class VoiceMemoApp(dspy.Module):
     def forward(self, requirements: str) -> dspy.Prediction:
         return self.generate_template(requirements=requirements)
 
+    async def aforward(self, requirements: str) -> dspy.Prediction:
+        return await self.generate_template.acall(requirements=requirements)
+
 
 class AssessTemplateQuality(dspy.Signature):
     """Evaluate generated template quality against user requirements."""
@@ -96,19 +125,59 @@ class AssessTemplateQuality(dspy.Signature):
     )
 
 
-def configure_lm(main_model: str = DEFAULT_MAIN_MODEL, max_tokens: int = DEFAULT_MAX_TOKENS) -> dspy.LM:
+class AssessTemplateQualityDelta(dspy.Signature):
+    """Re-evaluate a template whose leading blocks were already judged, given only the blocks that changed."""
+
+    requirements: str = dspy.InputField(desc="The user's requirements or instructions for the template.")
+    previous_verdict: str = dspy.InputField(desc="Rationale given for the previously judged version of the template.")
+    previous_scores: dict[str, float] = dspy.InputField(
+        desc="Scores from 0.0 to 1.0 assigned to the previous version, keyed by criterion."
+    )
+    new_template_tail: str = dspy.InputField(
+        desc="Trailing blocks that replace the end of the previous template. Earlier blocks are unchanged."
+    )
+
+    score_deltas: dict[str, float] = dspy.OutputField(
+        desc=(
+            "Change from -1.0 to 1.0 to apply to each previous score, keyed by the same criteria. "
+            "Use 0.0 for criteria the new tail does not affect."
+        )
+    )
+    rationale: str = dspy.OutputField(
+        desc="Concise explanation of how the new tail changes the previous verdict.",
+        type_=str,
+    )
+
+
+def configure_lm(
+    main_model: str = DEFAULT_MAIN_MODEL,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    async_max_workers: int = DEFAULT_ASYNC_MAX_WORKERS,
+) -> dspy.LM:
     """Configure the default DSPy LM for template generation."""
     main_lm = dspy.LM(model=main_model, max_tokens=max_tokens)
-    dspy.configure(lm=main_lm)
+    dspy.configure(lm=main_lm, async_max_workers=async_max_workers)
     return main_lm
 
 
-def make_judge(judge_model: str = DEFAULT_JUDGE_MODEL) -> tuple[dspy.LM, dspy.Module]:
-    """Create the judge LM and module used by optimizers."""
-    judge_lm = dspy.LM(model=judge_model)
+def make_judge(
+    judge_model: str = DEFAULT_JUDGE_MODEL,
+    temperature: float | None = DEFAULT_JUDGE_TEMPERATURE,
+) -> tuple[dspy.LM, dspy.Module]:
+    """Create the judge LM and module used by optimizers.
+
+    Only a ``temperature=0`` judge has its verdicts cached. The default gpt-5-mini is an OpenAI reasoning model that
+    rejects any temperature but its default, so pair ``temperature=0`` with a judge such as ``openai/gpt-4o``.
+    """
+    judge_lm = dspy.LM(model=judge_model, temperature=temperature)
     return judge_lm, dspy.ChainOfThought(AssessTemplateQuality)
 
 
+def make_delta_judge() -> dspy.Module:
+    """Create the judge module used for incremental re-evaluation of a changed template tail."""
+    return dspy.ChainOfThought(AssessTemplateQualityDelta)
+
+
 def _coerce_score(value: Any) -> float:
     try:
         score = float(value)
@@ -117,30 +186,198 @@ def _coerce_score(value: Any) -> float:
     return min(max(score, 0.0), 1.0)
 
 
-def build_llm_judge_metric(judge_lm: dspy.LM | None = None, judge: dspy.Module | None = None):
-    """Create a DSPy metric that returns both score and textual feedback."""
+def _coerce_delta(value: Any) -> float:
+    try:
+        delta = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return min(max(delta, -1.0), 1.0)
+
+
+def _assessment_scores(assessment: dspy.Prediction) -> list[float]:
+    return [_coerce_score(getattr(assessment, name)) for name in SCORE_FIELDS]
+
+
+def _metric_prediction(scores: list[float], rationale: str) -> dspy.Prediction:
+    total_score = math.sumprod(_SCORE_WEIGHTS, scores)
+    return dspy.Prediction(score=total_score, feedback=rationale)
+
+
+@dataclass
+class _JudgePlan:
+    fields: tuple[str, str]
+    incremental_key: str | None = None
+    session_key: str | None = None
+    hashes: list[int] = field(default_factory=list)
+    result: dspy.Prediction | None = None
+    delta_inputs: dict[str, Any] | None = None
+    previous_scores: list[float] = field(default_factory=list)
+
+
+class _JudgeBookkeeping:
+    """Cache lookups and incremental-judging decisions shared by the sync and async metrics.
+
+    Deltas are always taken against the last *full* verdict for the requirements, never against another delta, and
+    whatever score incremental judging produces for a template is pinned to it, so re-scoring the same template
+    gives the same result regardless of evaluation order. Anchors and pins are stored whatever the judge temperature:
+    reusing an earlier verdict is the point of incremental mode, so the temperature-0 rule only gates the exact cache.
+    """
+
+    def __init__(
+        self,
+        judge_lm: dspy.LM,
+        judge: dspy.Module,
+        cache: JudgeCache | None,
+        delta_judge: dspy.Module | None,
+        incr_threshold: float,
+    ):
+        self.verdicts = VerdictStore(judge_lm, judge, cache, num_scores=len(SCORE_FIELDS))
+        self.sessions = cache if delta_judge is not None else None
+        self.incremental_fingerprint = judge_fingerprint(delta_judge) if delta_judge is not None else ""
+        self.incr_threshold = incr_threshold
+
+    def plan(self, requirements: str, template: str) -> _JudgePlan:
+        plan = _JudgePlan(fields=(requirements, template))
+        cached = self.verdicts.get(*plan.fields)
+        if cached is not None:
+            plan.result = _metric_prediction(*cached)
+            return plan
+
+        if self.sessions is None:
+            return plan
+
+        plan.incremental_key = self.verdicts.key(self.incremental_fingerprint, requirements, template)
+        pinned = self.sessions.get_incremental(plan.incremental_key)
+        if pinned is not None and len(pinned[0]) == len(SCORE_FIELDS):
+            plan.result = _metric_prediction(*pinned)
+            return plan
+
+        blocks = split_blocks(template)
+        plan.hashes = block_hashes(blocks)
+        plan.session_key = self.verdicts.key(requirements)
+        anchor = self.sessions.get_session(plan.session_key)
+        if anchor is None:
+            return plan
+
+        anchor_hashes, anchor_scores, anchor_rationale = anchor
+        if len(anchor_scores) != len(SCORE_FIELDS):
+            return plan
+        prefix = delta_prefix(anchor_hashes, plan.hashes, self.incr_threshold)
+        if prefix is None:
+            return plan
+        if prefix == len(plan.hashes):
+            plan.result = _metric_prediction(anchor_scores, anchor_rationale)
+            return plan
+
+        plan.previous_scores = anchor_scores
+        plan.delta_inputs = {
+            "requirements": requirements,
+            "previous_verdict": anchor_rationale,
+            "previous_scores": dict(zip(SCORE_FIELDS, anchor_scores, strict=True)),
+            "new_template_tail": "\n\n".join(blocks[prefix:]),
+        }
+        return plan
+
+    def finish(self, plan: _JudgePlan, assessment: dspy.Prediction) -> dspy.Prediction:
+        scores = _assessment_scores(assessment)
+        self.verdicts.set(plan.fields, scores, assessment.rationale)
+        if self.sessions is not None and plan.session_key is not None and plan.incremental_key is not None:
+            self.sessions.set_session(plan.session_key, plan.hashes, scores, assessment.rationale)
+            self.sessions.set_incremental(plan.incremental_key, scores, assessment.rationale)
+        return _metric_prediction(scores, assessment.rationale)
+
+    def finish_delta(self, plan: _JudgePlan, delta: dspy.Prediction) -> dspy.Prediction:
+        deltas = delta.score_deltas if isinstance(delta.score_deltas, dict) else {}
+        scores = [
+            _coerce_score(previous + _coerce_delta(deltas.get(name)))
+            for name, previous in zip(SCORE_FIELDS, plan.previous_scores, strict=True)
+        ]
+        # Delta verdicts are approximations: they never become an anchor or enter the exact cache.
+        if self.sessions is not None and plan.incremental_key is not None:
+            self.sessions.set_incremental(plan.incremental_key, scores, delta.rationale)
+        return _metric_prediction(scores, delta.rationale)
+
+
+def build_llm_judge_metric(
+    judge_lm: dspy.LM | None = None,
+    judge: dspy.Module | None = None,
+    cache: JudgeCache | None = None,
+    delta_judge: dspy.Module | None = None,
+    incr_threshold: float = DEFAULT_INCR_THRESHOLD,
+):
+    """Create a DSPy metric that returns both score and textual feedback.
+
+    With a ``cache`` and a temperature-0 judge, verdicts for an already seen (requirements, template) pair are
+    served from disk instead of calling the judge again. Passing a ``delta_judge`` as well enables incremental
+    judging: when a template shares at least ``incr_threshold`` of its blocks with the last one fully judged for the
+    same requirements and only its tail changed, only that tail is sent along with the previous verdict.
+    Incremental judging persists its verdicts in ``cache`` even for a sampling judge, so a template keeps the first
+    score it was given.
+    """
     if judge_lm is None or judge is None:
         judge_lm, judge = make_judge()
+    bookkeeping = _JudgeBookkeeping(judge_lm, judge, cache, delta_judge, incr_threshold)
 
     def llm_judge_metric(example, pred, trace=None):
+        plan = bookkeeping.plan(example.requirements, pred.template)
+        if plan.result is not None:
+            return plan.result
+
         with dspy.context(lm=judge_lm):
+            if plan.delta_inputs is not None and delta_judge is not None:
+                delta = delta_judge(**plan.delta_inputs)
+                return bookkeeping.finish_delta(plan, delta)
             assessment = judge(requirements=example.requirements, template=pred.template)
-
-        scores = [
-            assessment.general_score,
-            assessment.tone_score,
-            assessment.hierarchy_score,
-            assessment.scenario_alignment_score,
-            assessment.audience_match_score,
-            assessment.language_consistency_score,
-            assessment.language_appropriateness_score,
-        ]
-        total_score = sum(_coerce_score(score) for score in scores) / len(scores)
-        return dspy.Prediction(score=total_score, feedback=assessment.rationale)
+        return bookkeeping.finish(plan, assessment)
 
     return llm_judge_metric
 
 
+def build_async_llm_judge_metric(
+    judge_lm: dspy.LM | None = None,
+    judge: dspy.Module | None = None,
+    cache: JudgeCache | None = None,
+    delta_judge: dspy.Module | None = None,
+    incr_threshold: float = DEFAULT_INCR_THRESHOLD,
+):
+    """Awaitable ``build_llm_judge_metric``; full and delta judge calls go through ``acall`` so pairs overlap."""
+    if judge_lm is None or judge is None:
+        judge_lm, judge = make_judge()
+    bookkeeping = _JudgeBookkeeping(judge_lm, judge, cache, delta_judge, incr_threshold)
+
+    async def allm_judge_metric(example, pred, trace=None):
+        plan = bookkeeping.plan(example.requirements, pred.template)
+        if plan.result is not None:
+            return plan.result
+
+        with dspy.context(lm=judge_lm):
+            if plan.delta_inputs is not None and delta_judge is not None:
+                delta = await delta_judge.acall(**plan.delta_inputs)
+                return bookkeeping.finish_delta(plan, delta)
+            assessment = await judge.acall(requirements=example.requirements, template=pred.template)
+        return bookkeeping.finish(plan, assessment)
+
+    return allm_judge_metric
+
+
+def judge_inputs(example: dspy.Example, pred: dspy.Prediction) -> dict[str, str]:
+    """Return the judge keyword arguments for an (example, prediction) pair."""
+    return {"requirements": example.requirements, "template": pred.template}
+
+
+def build_batch_judge_scorer(
+    judge_lm: dspy.LM | None = None,
+    judge: dspy.Module | None = None,
+    cache: JudgeCache | None = None,
+):
+    """Create a Batch API scorer for offline evaluation of generated templates; cached verdicts are not resent."""
+    if judge_lm is None or judge is None:
+        judge_lm, judge = make_judge()
+    return build_batch_scorer(
+        judge_lm, judge, judge_inputs, _assessment_scores, _metric_prediction, cache=cache, num_scores=len(SCORE_FIELDS)
+    )
+
+
 def load_program(path: str | Path) -> VoiceMemoApp:
     """Load a compiled VoiceMemoApp from disk."""
     program = VoiceMemoApp()
@@ -164,19 +401,30 @@ def generate_template(
 __all__ = [
     "AnalyzeRequirement",
     "AssessTemplateQuality",
+    "AssessTemplateQualityDelta",
+    "DEFAULT_ASYNC_MAX_WORKERS",
+    "DEFAULT_INCR_THRESHOLD",
     "DEFAULT_JUDGE_MODEL",
+    "DEFAULT_JUDGE_TEMPERATURE",
     "DEFAULT_MAIN_MODEL",
     "DEFAULT_MAX_TOKENS",
+    "DEFAULT_NUM_THREADS",
+    "SCORE_FIELDS",
     "TemplateGenerator",
     "VoiceMemoApp",
+    "build_async_llm_judge_metric",
+    "build_batch_judge_scorer",
     "build_llm_judge_metric",
     "configure_lm",
     "generate_template",
+    "judge_inputs",
     "load_program",
+    "make_delta_judge",
     "make_judge",
 ]
 
 
 if __name__ == "__main__":
+    load_dotenv()
     requirement_text = input("Enter your requirements: ")
     print(generate_template(requirement_text))
@@ -3,14 +3,15 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import os
 from pathlib import Path
 
 import chainlit as cl
-from ollama import Client
+from ollama import AsyncClient
 
-from openllm_prompt_mender.apps.audio_assistant import generate_template
+from openllm_prompt_mender.apps.audio_assistant import VoiceMemoApp, configure_lm, load_program
 
 DEFAULT_OLLAMA_HOST = "http://localhost:11434"
 DEFAULT_OLLAMA_MODEL = "Qwen3-4B-2507-RL-global-285-0123-fp16"
@@ -69,12 +70,18 @@ class TokenStreamExtractor:
         return pending[:split_index], pending[split_index:]
 
 
+@functools.lru_cache(maxsize=8)
+def _read_prompt_messages(path: str, mtime_ns: int) -> tuple[dict[str, str], ...]:
+    with open(path, encoding="utf-8") as file:
+        return tuple(json.load(file))
+
+
 def load_prompt_messages(prompt_path: str | Path) -> list[dict[str, str]] | None:
+    """Return the dumped prompt messages, re-reading the file only when its mtime changes."""
     path = Path(prompt_path)
     if not path.exists():
         return None
-    with path.open("r", encoding="utf-8") as file:
-        return json.load(file)
+    return [dict(message) for message in _read_prompt_messages(str(path), path.stat().st_mtime_ns)]
 
 
 def build_prompt_messages(requirements: str, prompt_path: str | Path = DEFAULT_PROMPT_PATH) -> list[dict[str, str]] | None:
@@ -82,7 +89,6 @@ def build_prompt_messages(requirements: str, prompt_path: str | Path = DEFAULT_P
     if not messages:
         return None
 
-    messages = [dict(message) for message in messages]
     messages[-1]["content"] = (
         "[[ ## requirements ## ]]\n"
         f"{requirements}\n\n"
@@ -96,12 +102,12 @@ async def stream_ollama_template(requirements: str, stream_msg: cl.Message) -> b
     if not messages:
         return False
 
-    client = Client(host=os.environ.get("OLLAMA_HOST", DEFAULT_OLLAMA_HOST))
+    client = AsyncClient(host=os.environ.get("OLLAMA_HOST", DEFAULT_OLLAMA_HOST))
     model_name = os.environ.get("AUDIO_ASSISTANT_OLLAMA_MODEL", DEFAULT_OLLAMA_MODEL)
     extractor = TokenStreamExtractor()
 
-    response = client.chat(model=model_name, messages=messages, stream=True)
-    for chunk in response:
+    response = await client.chat(model=model_name, messages=messages, stream=True)
+    async for chunk in response:
         chunk_text = chunk.message.get("content", "") if chunk.message else ""
         for segment in extractor.feed(chunk_text):
             if segment:
@@ -110,6 +116,29 @@ async def stream_ollama_template(requirements: str, stream_msg: cl.Message) -> b
     return True
 
 
+@functools.cache
+def _configure_main_lm() -> None:
+    # dspy.configure may only be re-run by the task that first called it, and every chainlit message is a new task,
+    # so the LM is configured exactly once per process rather than whenever a program is (re)loaded.
+    configure_lm()
+
+
+@functools.lru_cache(maxsize=4)
+def _build_program(compiled_path: str, mtime_ns: int | None) -> VoiceMemoApp:
+    return load_program(compiled_path) if mtime_ns is not None else VoiceMemoApp()
+
+
+def get_program(compiled_path: str) -> VoiceMemoApp:
+    """Return the program for ``compiled_path``, reloading only when the file appears or its mtime changes.
+
+    Falls back to the base ``VoiceMemoApp`` while no compiled program exists.
+    """
+    _configure_main_lm()
+    path = Path(compiled_path)
+    mtime_ns = path.stat().st_mtime_ns if path.exists() else None
+    return _build_program(str(path), mtime_ns)
+
+
 @cl.on_message
 async def render_ui(message: cl.Message):
     requirements = message.content.strip()
@@ -124,7 +153,7 @@ async def render_ui(message: cl.Message):
         await stream_msg.update()
         return
 
-    compiled_path = os.environ.get("AUDIO_ASSISTANT_COMPILED_PATH", DEFAULT_COMPILED_PROGRAM)
-    template = generate_template(requirements, compiled_path=compiled_path if Path(compiled_path).exists() else None)
-    stream_msg.content = template
+    program = get_program(os.environ.get("AUDIO_ASSISTANT_COMPILED_PATH", DEFAULT_COMPILED_PROGRAM))
+    prediction = await program.acall(requirements=requirements)
+    stream_msg.content = prediction.template
     await stream_msg.update()
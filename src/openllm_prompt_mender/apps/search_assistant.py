@@ -3,16 +3,24 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 import random
 from collections.abc import Iterable
 from typing import Any
 
+import aiohttp
 import dspy
 from dotenv import load_dotenv
-from google_cse import GoogleCSE
 
-load_dotenv()
+from openllm_prompt_mender.utils.batch_utils import build_batch_scorer
+from openllm_prompt_mender.utils.eval_utils import DEFAULT_ASYNC_MAX_WORKERS
+from openllm_prompt_mender.utils.judge_cache import JudgeCache, VerdictStore
+from openllm_prompt_mender.utils.search_cache import SearchCache
+
+GOOGLE_CSE_URL = "https://www.googleapis.com/customsearch/v1"
+# The Custom Search JSON API returns at most 10 results per request.
+GOOGLE_CSE_MAX_RESULTS = 10
 
 
 class WebRAGWithCitations(dspy.Signature):
@@ -69,15 +77,19 @@ class AssessQuality(dspy.Signature):
     rationale = dspy.OutputField(desc="Textual explanation for the given assessment scores")
 
 
-def configure_lm(main_model: str = "openai/gpt-4.1-mini") -> dspy.LM:
+def configure_lm(
+    main_model: str = "openai/gpt-4.1-mini",
+    async_max_workers: int = DEFAULT_ASYNC_MAX_WORKERS,
+) -> dspy.LM:
     """Configure the default DSPy LM for this app and return it."""
     main_lm = dspy.LM(main_model)
-    dspy.configure(lm=main_lm)
+    dspy.configure(lm=main_lm, async_max_workers=async_max_workers)
     return main_lm
 
 
-def make_judge(judge_model: str = "openai/gpt-4o") -> tuple[dspy.LM, dspy.Module]:
-    judge_lm = dspy.LM(judge_model)
+def make_judge(judge_model: str = "openai/gpt-4o", temperature: float | None = 0.0) -> tuple[dspy.LM, dspy.Module]:
+    """Create the judge LM and module; the temperature-0 default keeps verdicts cacheable."""
+    judge_lm = dspy.LM(judge_model, temperature=temperature)
     return judge_lm, dspy.ChainOfThought(AssessQuality)
 
 
@@ -89,46 +101,173 @@ def _as_bool(value: Any) -> bool:
     return bool(value)
 
 
-def build_llm_judge_metric(judge_lm: dspy.LM | None = None, judge: dspy.Module | None = None):
-    """Create a metric callable suitable for DSPy optimizers."""
+def _assessment_scores(assessment: dspy.Prediction) -> list[float]:
+    return [
+        float(assessment.is_grounded),
+        float(_as_bool(assessment.language_match)),
+        float(_as_bool(assessment.citation_correct)),
+    ]
+
+
+def _metric_prediction(scores: list[float], rationale: str) -> dspy.Prediction:
+    total_score = sum(scores) / 3.0
+    return dspy.Prediction(score=total_score, feedback=rationale)
+
+
+def build_llm_judge_metric(
+    judge_lm: dspy.LM | None = None,
+    judge: dspy.Module | None = None,
+    cache: JudgeCache | None = None,
+):
+    """Create a metric callable suitable for DSPy optimizers.
+
+    With a ``cache`` and a temperature-0 judge, repeated (context, question, answer) triples reuse stored verdicts.
+    """
     if judge_lm is None or judge is None:
         judge_lm, judge = make_judge()
+    verdicts = VerdictStore(judge_lm, judge, cache, num_scores=3)
 
     def llm_judge_metric(example, pred, trace=None):
+        fields = (example.context, example.question, pred.answer)
+        cached = verdicts.get(*fields)
+        if cached is not None:
+            return _metric_prediction(*cached)
+
         with dspy.context(lm=judge_lm):
             assessment = judge(context=example.context, question=example.question, answer=pred.answer)
 
-        total_score = (
-            float(assessment.is_grounded)
-            + float(_as_bool(assessment.language_match))
-            + float(_as_bool(assessment.citation_correct))
-        ) / 3.0
-
-        return dspy.Prediction(score=total_score, feedback=assessment.rationale)
+        scores = _assessment_scores(assessment)
+        verdicts.set(fields, scores, assessment.rationale)
+        return _metric_prediction(scores, assessment.rationale)
 
     return llm_judge_metric
 
 
-def build_trainset(queries: Iterable[str], min_results: int = 1, max_results: int = 10) -> list[dspy.Example]:
-    """Build a DSPy trainset by retrieving snippets from Google CSE."""
-    api_key = os.environ.get("GOOGLE_CSE_API_KEY")
-    search_engine_id = os.environ.get("GOOGLE_CSE_CX")
-    if not api_key or not search_engine_id:
-        msg = "GOOGLE_CSE_API_KEY and GOOGLE_CSE_CX must be set to build a search trainset."
-        raise RuntimeError(msg)
+def build_async_llm_judge_metric(
+    judge_lm: dspy.LM | None = None,
+    judge: dspy.Module | None = None,
+    cache: JudgeCache | None = None,
+):
+    """Async counterpart of ``build_llm_judge_metric`` for use with ``utils.eval_utils.run_eval``."""
+    if judge_lm is None or judge is None:
+        judge_lm, judge = make_judge()
+    verdicts = VerdictStore(judge_lm, judge, cache, num_scores=3)
 
-    google_client = GoogleCSE(api_key=api_key, search_engine_id=search_engine_id)
-    trainset = []
+    async def allm_judge_metric(example, pred, trace=None):
+        fields = (example.context, example.question, pred.answer)
+        cached = verdicts.get(*fields)
+        if cached is not None:
+            return _metric_prediction(*cached)
+
+        with dspy.context(lm=judge_lm):
+            assessment = await judge.acall(context=example.context, question=example.question, answer=pred.answer)
+
+        scores = _assessment_scores(assessment)
+        verdicts.set(fields, scores, assessment.rationale)
+        return _metric_prediction(scores, assessment.rationale)
 
-    for question in queries:
+    return allm_judge_metric
+
+
+def judge_inputs(example: dspy.Example, pred: dspy.Prediction) -> dict[str, str]:
+    """Return the judge keyword arguments for an (example, prediction) pair."""
+    return {"context": example.context, "question": example.question, "answer": pred.answer}
+
+
+def build_batch_judge_scorer(
+    judge_lm: dspy.LM | None = None,
+    judge: dspy.Module | None = None,
+    cache: JudgeCache | None = None,
+):
+    """Create a Batch API scorer for offline evaluation of cited answers; cached verdicts are not resent."""
+    if judge_lm is None or judge is None:
+        judge_lm, judge = make_judge()
+    return build_batch_scorer(
+        judge_lm, judge, judge_inputs, _assessment_scores, _metric_prediction, cache=cache, num_scores=3
+    )
+
+
+async def _search_snippets(
+    session: aiohttp.ClientSession,
+    semaphore: asyncio.Semaphore,
+    params: dict[str, Any],
+    max_retries: int = 5,
+) -> list[str]:
+    for attempt in range(max_retries):
+        async with semaphore, session.get(GOOGLE_CSE_URL, params=params) as response:
+            if response.status != 429:
+                response.raise_for_status()
+                payload = await response.json()
+                return [item.get("snippet", "") for item in payload.get("items", [])]
+        # Back off outside the semaphore so other queries keep flowing while this one waits.
+        await asyncio.sleep(2**attempt)
+
+    msg = f"Google CSE kept rate limiting the query {params['q']!r}."
+    raise RuntimeError(msg)
+
+
+async def abuild_trainset(
+    queries: Iterable[str],
+    min_results: int = 1,
+    max_results: int = 10,
+    concurrency: int = 5,
+    cache: SearchCache | None = None,
+) -> list[dspy.Example]:
+    """Build a DSPy trainset from Google CSE, running up to ``concurrency`` searches at once.
+
+    With a ``cache``, queries already searched in a previous build are served from disk, and the API credentials are
+    only required when some query actually misses it.
+    """
+    questions = list(queries)
+    # Always request the largest page and sample locally, so the cache key does not depend on the draw.
+    fetch_size = min(max_results, GOOGLE_CSE_MAX_RESULTS)
+    snippets_by_question: dict[str, list[str]] = {}
+    if cache is not None:
+        for question in questions:
+            snippets = cache.get(question, fetch_size)
+            if snippets is not None:
+                snippets_by_question[question] = snippets
+
+    missing = [question for question in dict.fromkeys(questions) if question not in snippets_by_question]
+    if missing:
+        api_key = os.environ.get("GOOGLE_CSE_API_KEY")
+        search_engine_id = os.environ.get("GOOGLE_CSE_CX")
+        if not api_key or not search_engine_id:
+            msg = "GOOGLE_CSE_API_KEY and GOOGLE_CSE_CX must be set to build a search trainset."
+            raise RuntimeError(msg)
+
+        semaphore = asyncio.Semaphore(concurrency)
+        async with aiohttp.ClientSession() as session:
+
+            async def fetch(question: str) -> None:
+                params = {"key": api_key, "cx": search_engine_id, "q": question, "num": fetch_size}
+                snippets = await _search_snippets(session, semaphore, params)
+                if cache is not None:
+                    cache.set(question, fetch_size, snippets)
+                snippets_by_question[question] = snippets
+
+            await asyncio.gather(*(fetch(question) for question in missing))
+
+    trainset = []
+    for question in questions:
         num_results = random.randint(min_results, max_results)
-        search_results = google_client.web_search(question, num_results=num_results)
-        context = "\n".join(f"{idx + 1}. {result.snippet}" for idx, result in enumerate(search_results))
+        snippets = snippets_by_question[question][:num_results]
+        context = "\n".join(f"{idx + 1}. {snippet}" for idx, snippet in enumerate(snippets))
         trainset.append(dspy.Example(question=question, context=context).with_inputs("question", "context"))
-
     return trainset
 
 
+def build_trainset(
+    queries: Iterable[str],
+    min_results: int = 1,
+    max_results: int = 10,
+    concurrency: int = 5,
+    cache: SearchCache | None = None,
+) -> list[dspy.Example]:
+    """Build a DSPy trainset by retrieving snippets from Google CSE."""
+    return asyncio.run(abuild_trainset(queries, min_results, max_results, concurrency, cache))
+
+
 def answer(question: str, context: str, model: str = "openai/gpt-4.1-mini") -> dspy.Prediction:
     """Convenience entry point for direct, unoptimized inference."""
     configure_lm(model)
@@ -136,6 +275,7 @@ def answer(question: str, context: str, model: str = "openai/gpt-4.1-mini") -> d
 
 
 if __name__ == "__main__":
+    load_dotenv()
     sample_question = os.environ.get("PROMPT_MENDER_SAMPLE_QUESTION", "What is DSPy?")
     sample_context = os.environ.get("PROMPT_MENDER_SAMPLE_CONTEXT", "1. DSPy is a framework for programming LM pipelines.")
     print(answer(sample_question, sample_context).answer)
@@ -3,23 +3,19 @@
 
 """Console script for openllm_prompt_mender."""
 
-import typer
-from rich.console import Console
+import argparse
 
 from openllm_prompt_mender import utils
 
-app = typer.Typer()
-console = Console()
 
-
-@app.command()
-def main():
+def main(argv: list[str] | None = None) -> None:
     """Console script for openllm_prompt_mender."""
-    console.print("Replace this message by putting your code into "
-               "openllm_prompt_mender.cli.main")
-    console.print("See Typer documentation at https://typer.tiangolo.com/")
+    parser = argparse.ArgumentParser(prog="openllm-prompt-mender", description=__doc__)
+    parser.parse_args(argv)
+    print("Replace this message by putting your code into "
+          "openllm_prompt_mender.cli.main")
     utils.do_something_useful()
 
 
 if __name__ == "__main__":
-    app()
+    main()
@@ -10,14 +10,22 @@ from dotenv import load_dotenv
 
 from openllm_prompt_mender.apps.audio_assistant import (
     DEFAULT_JUDGE_MODEL,
+    DEFAULT_JUDGE_TEMPERATURE,
     DEFAULT_MAIN_MODEL,
     DEFAULT_MAX_TOKENS,
+    DEFAULT_NUM_THREADS,
     VoiceMemoApp,
+    build_async_llm_judge_metric,
+    build_batch_judge_scorer,
     build_llm_judge_metric,
     configure_lm,
+    make_delta_judge,
     make_judge,
 )
+from openllm_prompt_mender.utils.batch_utils import use_batch_api
 from openllm_prompt_mender.utils.data_utils import load_trainset
+from openllm_prompt_mender.utils.eval_utils import async_scorer, evaluate_program
+from openllm_prompt_mender.utils.judge_cache import JudgeCache, is_deterministic
 
 app = typer.Typer(help="Optimize the DSPy audio assistant.")
 
@@ -28,16 +36,33 @@ def main(
     output_path: Path = typer.Option(Path("audio_assistant.json"), help="Compiled DSPy program output path."),
     main_model: str = typer.Option(DEFAULT_MAIN_MODEL, help="Model used by the optimized program."),
     judge_model: str = typer.Option(DEFAULT_JUDGE_MODEL, help="Model used for judging and prompt optimization."),
+    judge_temperature: float | None = typer.Option(
+        DEFAULT_JUDGE_TEMPERATURE, help="Judge sampling temperature; 0 makes verdicts cacheable."
+    ),
     max_tokens: int = typer.Option(DEFAULT_MAX_TOKENS, help="Max tokens for the main model."),
     auto: str = typer.Option("light", help="MIPROv2 search budget: light, medium, or heavy."),
+    num_threads: int = typer.Option(DEFAULT_NUM_THREADS, help="Concurrent metric evaluations during compile."),
+    evaluate: bool = typer.Option(False, help="Score the compiled program; USE_BATCH_API=1 judges via Batch API."),
+    judge_cache: bool = typer.Option(True, help="Reuse temperature-0 judge verdicts cached under data/cache."),
+    incremental_judge: bool = typer.Option(
+        False, help="Judge only the changed tail of near-duplicate templates; caches at any temperature."
+    ),
 ):
     load_dotenv()
     if not trainset_path.exists():
         raise typer.BadParameter(f"Trainset not found: {trainset_path}")
+    if incremental_judge and not judge_cache:
+        raise typer.BadParameter("--incremental-judge needs the judge cache; drop --no-judge-cache.")
 
     configure_lm(main_model=main_model, max_tokens=max_tokens)
-    judge_lm, judge = make_judge(judge_model)
-    metric = build_llm_judge_metric(judge_lm=judge_lm, judge=judge)
+    judge_lm, judge = make_judge(judge_model, temperature=judge_temperature)
+    if judge_cache and not is_deterministic(judge_lm):
+        typer.echo(
+            "--judge-cache only reuses verdicts when --judge-temperature is 0; exact-match caching is off.", err=True
+        )
+    cache = JudgeCache.for_model(judge_model) if judge_cache else None
+    delta_judge = make_delta_judge() if incremental_judge else None
+    metric = build_llm_judge_metric(judge_lm=judge_lm, judge=judge, cache=cache, delta_judge=delta_judge)
     trainset = load_trainset(str(trainset_path), input_keys=("requirements",))
 
     from dspy.teleprompt import MIPROv2
@@ -47,11 +72,22 @@ def main(
         auto=auto,
         prompt_model=judge_lm,
         teacher_settings={"lm": judge_lm},
+        num_threads=num_threads,
     )
     compiled_program = teleprompter.compile(VoiceMemoApp(), trainset=trainset)
     compiled_program.save(str(output_path))
     typer.echo(f"Saved compiled audio assistant to {output_path}")
 
+    if evaluate:
+        if use_batch_api():
+            score_pairs = build_batch_judge_scorer(judge_lm=judge_lm, judge=judge, cache=cache)
+        else:
+            score_pairs = async_scorer(
+                build_async_llm_judge_metric(judge_lm=judge_lm, judge=judge, cache=cache, delta_judge=delta_judge)
+            )
+        score = evaluate_program(compiled_program, trainset, score_pairs, num_threads=num_threads)
+        typer.echo(f"Mean judge score on trainset: {score:.4f}")
+
 
 if __name__ == "__main__":
     app()
@@ -3,28 +3,36 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from pathlib import Path
 
-import dspy
 import typer
-from datasets import load_dataset
 from dotenv import load_dotenv
 
 from openllm_prompt_mender.apps.search_assistant import (
     GoogleRAG,
+    build_async_llm_judge_metric,
+    build_batch_judge_scorer,
     build_llm_judge_metric,
     build_trainset,
     configure_lm,
     make_judge,
 )
-from openllm_prompt_mender.utils.data_utils import load_trainset, save_trainset
+from openllm_prompt_mender.utils.batch_utils import use_batch_api
+from openllm_prompt_mender.utils.data_utils import load_json_bytes, load_trainset, save_trainset
+from openllm_prompt_mender.utils.eval_utils import DEFAULT_NUM_THREADS, async_scorer, evaluate_program
+from openllm_prompt_mender.utils.judge_cache import JudgeCache, is_deterministic
+from openllm_prompt_mender.utils.search_cache import SearchCache
 
 app = typer.Typer(help="Optimize the DSPy search assistant.")
 
 
-def load_queries(file_path: Path) -> list[str]:
-    dataset = load_dataset("json", data_files=str(file_path), split="train")
-    return list(dataset["query"])
+def load_queries(file_path: Path) -> Iterator[str]:
+    """Stream the ``query`` field of each JSONL line without materialising the file."""
+    with file_path.open("rb") as file:
+        for line in file:
+            if line.strip():
+                yield load_json_bytes(line)["query"]
 
 
 @app.command()
@@ -34,17 +42,25 @@ def main(
     output_path: Path = typer.Option(Path("search_assistant.json"), help="Compiled DSPy program output path."),
     main_model: str = typer.Option("openai/gpt-4.1-mini", help="Model used by the optimized program."),
     judge_model: str = typer.Option("openai/gpt-4o", help="Model used for judging and prompt optimization."),
+    judge_temperature: float | None = typer.Option(0.0, help="Judge sampling temperature; 0 makes verdicts cacheable."),
     auto: str = typer.Option("light", help="MIPROv2 search budget: light, medium, or heavy."),
+    num_threads: int = typer.Option(DEFAULT_NUM_THREADS, help="Concurrent metric evaluations during compile."),
+    evaluate: bool = typer.Option(False, help="Score the compiled program; USE_BATCH_API=1 judges via Batch API."),
+    judge_cache: bool = typer.Option(True, help="Reuse temperature-0 judge verdicts cached under data/cache."),
+    search_cache: bool = typer.Option(True, help="Reuse Google CSE results cached under data/cache."),
 ):
     load_dotenv()
     configure_lm(main_model)
-    judge_lm, judge = make_judge(judge_model)
-    metric = build_llm_judge_metric(judge_lm=judge_lm, judge=judge)
+    judge_lm, judge = make_judge(judge_model, temperature=judge_temperature)
+    if judge_cache and not is_deterministic(judge_lm):
+        typer.echo("--judge-cache only reuses verdicts when --judge-temperature is 0; caching is off.", err=True)
+    cache = JudgeCache.for_model(judge_model) if judge_cache else None
+    metric = build_llm_judge_metric(judge_lm=judge_lm, judge=judge, cache=cache)
 
     if trainset_path.exists():
         trainset = load_trainset(str(trainset_path))
     else:
-        trainset = build_trainset(load_queries(queries_path))
+        trainset = build_trainset(load_queries(queries_path), cache=SearchCache() if search_cache else None)
         trainset_path.parent.mkdir(parents=True, exist_ok=True)
         save_trainset(trainset, str(trainset_path))
 
@@ -55,11 +71,20 @@ def main(
         auto=auto,
         prompt_model=judge_lm,
         teacher_settings={"lm": judge_lm},
+        num_threads=num_threads,
     )
     compiled_program = teleprompter.compile(GoogleRAG(), trainset=trainset)
     compiled_program.save(str(output_path))
     typer.echo(f"Saved compiled search assistant to {output_path}")
 
+    if evaluate:
+        if use_batch_api():
+            score_pairs = build_batch_judge_scorer(judge_lm=judge_lm, judge=judge, cache=cache)
+        else:
+            score_pairs = async_scorer(build_async_llm_judge_metric(judge_lm=judge_lm, judge=judge, cache=cache))
+        score = evaluate_program(compiled_program, trainset, score_pairs, num_threads=num_threads)
+        typer.echo(f"Mean judge score on trainset: {score:.4f}")
+
 
 if __name__ == "__main__":
     app()
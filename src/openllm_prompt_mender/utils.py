@@ -1,5 +0,0 @@
-# Copyright (c) 2025 Loong Ma
-# SPDX-License-Identifier: MIT
-
-def do_something_useful():
-    print("Replace this with a utility function")
@@ -0,0 +1,172 @@
+# Copyright (c) 2025 Loong Ma
+# SPDX-License-Identifier: MIT
+
+"""Offline execution of a single-predictor DSPy module through the OpenAI Batch API via LiteLLM.
+
+Batch jobs are cheaper and have much higher throughput than per-request calls, but can take up to the
+completion window to finish, so they are only meant for offline scoring and are gated by ``USE_BATCH_API=1``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import dspy
+
+from openllm_prompt_mender.utils.eval_utils import PairScorer
+from openllm_prompt_mender.utils.judge_cache import JudgeCache, VerdictStore
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+DEFAULT_COMPLETION_WINDOW = "24h"
+DEFAULT_POLL_INTERVAL = 30.0
+# The completion window plus some slack for the provider to flip the job to a terminal status.
+DEFAULT_BATCH_TIMEOUT = 26 * 60 * 60.0
+_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def use_batch_api() -> bool:
+    """Return True when offline judge calls should go through the Batch API."""
+    return os.environ.get("USE_BATCH_API") == "1"
+
+
+def _split_model(model: str) -> tuple[str, str]:
+    provider, _, name = model.partition("/")
+    if not name:
+        return "openai", provider
+    return provider, name
+
+
+def _single_predictor(module: dspy.Module) -> tuple[dspy.Predict, type[dspy.Signature]]:
+    predictors = module.predictors()
+    if len(predictors) != 1:
+        msg = f"Batch execution needs a module with exactly one predictor, got {len(predictors)}."
+        raise ValueError(msg)
+    predictor = predictors[0]
+    if predictor.signature is None:
+        msg = "Batch execution needs a predictor with a signature."
+        raise ValueError(msg)
+    return predictor, predictor.signature
+
+
+def batch_predict(
+    module: dspy.Module,
+    lm: dspy.LM,
+    inputs: Sequence[dict[str, Any]],
+    *,
+    completion_window: str = DEFAULT_COMPLETION_WINDOW,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    timeout: float | None = DEFAULT_BATCH_TIMEOUT,
+) -> list[dspy.Prediction | None]:
+    """Run ``module`` on every input in one Batch API job.
+
+    Prompts are rendered with the active DSPy adapter so the outputs parse exactly like a normal call.
+    Results are returned in input order; requests that failed or could not be parsed are ``None``.
+    If the job is still running after ``timeout`` seconds it is cancelled and ``TimeoutError`` is raised.
+    """
+    import litellm
+
+    if not inputs:
+        return []
+
+    predictor, signature = _single_predictor(module)
+    adapter = dspy.settings.adapter or dspy.ChatAdapter()
+    provider, model_name = _split_model(lm.model)
+    request_kwargs = {key: value for key, value in lm.kwargs.items() if value is not None}
+
+    with tempfile.NamedTemporaryFile("w", suffix=".jsonl", encoding="utf-8", delete=False) as request_file:
+        for index, example_inputs in enumerate(inputs):
+            messages = adapter.format(signature, predictor.demos, dict(example_inputs))
+            request = {
+                "custom_id": str(index),
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": {"model": model_name, "messages": messages, **request_kwargs},
+            }
+            request_file.write(json.dumps(request, ensure_ascii=False) + "\n")
+
+    try:
+        with open(request_file.name, "rb") as file:
+            uploaded = litellm.create_file(file=file, purpose="batch", custom_llm_provider=provider)
+    finally:
+        os.unlink(request_file.name)
+
+    batch = litellm.create_batch(
+        completion_window=completion_window,
+        endpoint=BATCH_ENDPOINT,
+        input_file_id=uploaded.id,
+        custom_llm_provider=provider,
+    )
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while batch.status not in _TERMINAL_STATUSES:
+        if deadline is not None and time.monotonic() >= deadline:
+            litellm.cancel_batch(batch_id=batch.id, custom_llm_provider=provider)
+            msg = f"Batch {batch.id} did not finish within {timeout:.0f}s (last status {batch.status!r})."
+            raise TimeoutError(msg)
+        time.sleep(poll_interval)
+        batch = litellm.retrieve_batch(batch_id=batch.id, custom_llm_provider=provider)
+
+    if batch.status != "completed" or not batch.output_file_id:
+        msg = f"Batch {batch.id} finished with status {batch.status!r}."
+        raise RuntimeError(msg)
+
+    output = litellm.file_content(file_id=batch.output_file_id, custom_llm_provider=provider)
+    results: list[dspy.Prediction | None] = [None] * len(inputs)
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        body = (record.get("response") or {}).get("body") or {}
+        choices = body.get("choices") or []
+        if not choices:
+            continue
+        try:
+            fields = adapter.parse(signature, choices[0]["message"]["content"])
+        except Exception:
+            continue
+        results[int(record["custom_id"])] = dspy.Prediction(**fields)
+
+    return results
+
+
+def build_batch_scorer(
+    judge_lm: dspy.LM,
+    judge: dspy.Module,
+    judge_inputs: Callable[[dspy.Example, dspy.Prediction], dict[str, str]],
+    assessment_scores: Callable[[dspy.Prediction], list[float]],
+    metric_prediction: Callable[[list[float], str], dspy.Prediction],
+    cache: JudgeCache | None = None,
+    num_scores: int | None = None,
+) -> PairScorer:
+    """Create a pair scorer that sends every uncached judge call of a run in one Batch API job.
+
+    ``judge_inputs`` maps a pair to the judge's keyword arguments; their values, in order, are also the cache fields,
+    so verdicts are shared with online metrics built with the same field order. Failed requests score zero.
+    """
+    verdicts = VerdictStore(judge_lm, judge, cache, num_scores=num_scores)
+
+    def score_pairs(examples: Sequence[dspy.Example], preds: Sequence[dspy.Prediction]) -> list[dspy.Prediction]:
+        inputs = [judge_inputs(example, pred) for example, pred in zip(examples, preds, strict=True)]
+        results: list[dspy.Prediction | None] = []
+        pending: list[int] = []
+        for index, example_inputs in enumerate(inputs):
+            cached = verdicts.get(*example_inputs.values())
+            results.append(None if cached is None else metric_prediction(*cached))
+            if cached is None:
+                pending.append(index)
+
+        assessments = batch_predict(judge, judge_lm, [inputs[index] for index in pending])
+        for index, assessment in zip(pending, assessments, strict=True):
+            if assessment is None:
+                results[index] = dspy.Prediction(score=0.0, feedback="Batch judge request failed.")
+                continue
+            scores = assessment_scores(assessment)
+            verdicts.set(tuple(inputs[index].values()), scores, assessment.rationale)
+            results[index] = metric_prediction(scores, assessment.rationale)
+        return [result for result in results if result is not None]
+
+    return score_pairs
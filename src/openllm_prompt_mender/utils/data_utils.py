@@ -1,30 +1,103 @@
 # Copyright (c) 2025 Loong Ma
 # SPDX-License-Identifier: MIT
 
-import json
 import random
+from collections.abc import Iterator
+from itertools import islice
+from pathlib import Path
+
 import dspy
-from typing import List
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    import json
+
+    orjson = None
+
+
+def dump_json_bytes(data) -> bytes:
+    """Serialise ``data`` to UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def load_json_bytes(line: bytes):
+    """Parse JSON from bytes or str, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
 
 # 1. Save the trainset to a local JSONL file
 
-def save_trainset(trainset: List[dspy.Example], file_path: str) -> None:
-    with open(file_path, 'w', encoding='utf-8') as f:
+def save_trainset(trainset: list[dspy.Example], file_path: str) -> None:
+    with open(file_path, 'wb') as f:
         for ex in trainset:
             # Convert dspy.Example to a dictionary using .toDict()
             # This captures all fields like question, context, answer, etc.
-            f.write(json.dumps(ex.toDict(), ensure_ascii=False) + '\n')
+            f.write(dump_json_bytes(ex.toDict()))
+            f.write(b'\n')
+
+# 2. Stream the trainset back from the JSONL file, one example or one chunk at a time
+def load_trainset_iter(file_path: str, input_keys: tuple=("question", "context")) -> Iterator[dspy.Example]:
+    """Lazily yield examples from a JSONL trainset without materialising the whole file.
+
+    Order follows the file; shuffle on the consumer side if needed. Note that ``MIPROv2.compile`` indexes its
+    trainset, so it still needs a list (see ``load_trainset``).
+    """
+    return _iter_examples(file_path, input_keys)
 
-# 2. Load the trainset back from the JSONL file
-def load_trainset(file_path: str, input_keys: tuple=("question", "context")) -> List[dspy.Example]:
-    loaded_data = []
-    with open(file_path, 'r', encoding='utf-8') as f:
+
+def load_trainset_chunks(
+    file_path: str,
+    chunk_size: int,
+    input_keys: tuple=("question", "context"),
+) -> Iterator[list[dspy.Example]]:
+    """Like ``load_trainset_iter`` but yield lists of up to ``chunk_size`` examples."""
+    examples = _iter_examples(file_path, input_keys)
+    while chunk := list(islice(examples, chunk_size)):
+        yield chunk
+
+
+def _iter_examples(file_path: str, input_keys: tuple) -> Iterator[dspy.Example]:
+    with open(file_path, 'rb') as f:
         for line in f:
-            data = json.loads(line)
+            data = load_json_bytes(line)
             # Reconstruct the dspy.Example object
             # Use .with_inputs() to specify which fields are inputs [4, 5]
-            example = dspy.Example(**data).with_inputs(*input_keys)
-            loaded_data.append(example)
-            random.shuffle(loaded_data)
+            yield dspy.Example(**data).with_inputs(*input_keys)
 
+# 3. Load the trainset back from the JSONL file
+def load_trainset(file_path: str, input_keys: tuple=("question", "context")) -> list[dspy.Example]:
+    loaded_data = list(load_trainset_iter(file_path, input_keys=input_keys))
+    random.shuffle(loaded_data)
     return loaded_data
+
+# 4. Sharded tar storage (WebDataset) for trainsets too large for a single JSONL file
+def save_trainset_wds(
+    trainset: list[dspy.Example],
+    pattern: str = "data/trainset-%06d.tar",
+    shard_size: int = 10000,
+) -> None:
+    """Write the trainset as sequential tar shards with one JSON member per example."""
+    from webdataset.writer import ShardWriter
+
+    Path(pattern).parent.mkdir(parents=True, exist_ok=True)
+    with ShardWriter(pattern, maxcount=shard_size) as sink:
+        for index, ex in enumerate(trainset):
+            sink.write({"__key__": f"{index:09d}", "json": dump_json_bytes(ex.toDict())})
+
+
+def load_trainset_wds(
+    urls: str | list[str],
+    input_keys: tuple=("question", "context"),
+) -> Iterator[dspy.Example]:
+    """Stream examples back from shards written by ``save_trainset_wds``.
+
+    ``urls`` accepts anything WebDataset does, e.g. ``"data/trainset-{000000..000009}.tar"``.
+    """
+    from webdataset.compat import WebDataset
+
+    for sample in WebDataset(urls, shardshuffle=False):
+        yield dspy.Example(**load_json_bytes(sample["json"])).with_inputs(*input_keys)
@@ -0,0 +1,72 @@
+# Copyright (c) 2025 Loong Ma
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+
+import dspy
+
+# Shared defaults for the optimizers: MIPROv2 metric threads and in-flight async judge calls.
+DEFAULT_NUM_THREADS = 32
+DEFAULT_ASYNC_MAX_WORKERS = 16
+
+AsyncMetric = Callable[..., Awaitable[dspy.Prediction]]
+PairScorer = Callable[[Sequence[dspy.Example], Sequence[dspy.Prediction]], list[dspy.Prediction]]
+
+
+async def run_eval(
+    metric: AsyncMetric,
+    examples: Sequence[dspy.Example],
+    preds: Sequence[dspy.Prediction],
+    max_concurrency: int | None = None,
+) -> list[dspy.Prediction]:
+    """Score every (example, prediction) pair concurrently with an async judge metric.
+
+    At most ``max_concurrency`` judge calls are in flight (``dspy.settings.async_max_workers`` by default), and a
+    pair whose metric raises scores zero instead of aborting the whole run.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or dspy.settings.async_max_workers)
+
+    async def score(example: dspy.Example, pred: dspy.Prediction) -> dspy.Prediction:
+        async with semaphore:
+            try:
+                return await metric(example, pred)
+            except Exception as exc:
+                return dspy.Prediction(score=0.0, feedback=f"Judge call failed: {exc}")
+
+    return await asyncio.gather(*(score(example, pred) for example, pred in zip(examples, preds, strict=True)))
+
+
+def async_scorer(metric: AsyncMetric, max_concurrency: int | None = None) -> PairScorer:
+    """Wrap an async metric into a blocking scorer for ``evaluate_program``."""
+
+    def score_pairs(examples: Sequence[dspy.Example], preds: Sequence[dspy.Prediction]) -> list[dspy.Prediction]:
+        return asyncio.run(run_eval(metric, examples, preds, max_concurrency))
+
+    return score_pairs
+
+
+def evaluate_program(
+    program: dspy.Module,
+    examples: Sequence[dspy.Example],
+    score_pairs: PairScorer,
+    num_threads: int | None = None,
+) -> float:
+    """Return the mean judge score of ``program`` over ``examples``.
+
+    Evaluation runs in two phases: predictions for every example are generated with ``Module.batch``, then all
+    pairs are handed to ``score_pairs`` at once. Examples whose prediction failed count as zero.
+    """
+    if not examples:
+        return 0.0
+
+    preds = program.batch(list(examples), num_threads=num_threads)
+    pairs = [(example, pred) for example, pred in zip(examples, preds, strict=True) if pred is not None]
+    if not pairs:
+        return 0.0
+
+    scored_examples, scored_preds = zip(*pairs, strict=True)
+    results = score_pairs(scored_examples, scored_preds)
+    return sum(result.score for result in results) / len(examples)
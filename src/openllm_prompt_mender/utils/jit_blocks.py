@@ -0,0 +1,100 @@
+# Copyright (c) 2025 Loong Ma
+# SPDX-License-Identifier: MIT
+
+"""Block hashing and overlap kernels for incremental judging.
+
+Templates are split into blocks by the caller and hashed block by block with 64-bit FNV-1a. When Numba and numpy are
+installed (``HAS_NUMBA``) the blocks are flattened into one UTF-8 byte buffer plus an ``int32`` lengths array and
+handed to compiled kernels; otherwise equivalent pure-Python implementations over ``bytes`` and ``set`` are used.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+FNV64_OFFSET = 0xCBF29CE484222325
+FNV64_PRIME = 0x100000001B3
+_U64_MASK = 0xFFFFFFFFFFFFFFFF
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is an optional speedup
+    HAS_NUMBA = False
+else:
+    HAS_NUMBA = True
+
+
+def _fnv64(data: bytes) -> int:
+    h = FNV64_OFFSET
+    for byte in data:
+        h = ((h ^ byte) * FNV64_PRIME) & _U64_MASK
+    return h
+
+
+def _hash_blocks_py(blocks: Sequence[str]) -> list[int]:
+    """Hash each block of text to a 64-bit integer."""
+    return [_fnv64(block.encode("utf-8")) for block in blocks]
+
+
+def _block_jaccard_py(a: Sequence[int], b: Sequence[int]) -> float:
+    """Jaccard overlap of two collections of block hashes."""
+    set_a, set_b = set(a), set(b)
+    union = len(set_a | set_b)
+    if union == 0:
+        return 1.0
+    return len(set_a & set_b) / union
+
+
+if HAS_NUMBA:
+
+    @njit(cache=True)
+    def block_fnv64(buf, lengths):
+        """Return the FNV-1a hash of each ``lengths``-sized slice of ``buf``."""
+        out = np.empty(lengths.shape[0], dtype=np.uint64)
+        prime = np.uint64(FNV64_PRIME)
+        pos = 0
+        for block in range(lengths.shape[0]):
+            h = np.uint64(FNV64_OFFSET)
+            for k in range(pos, pos + lengths[block]):
+                h = (h ^ np.uint64(buf[k])) * prime
+            out[block] = h
+            pos += lengths[block]
+        return out
+
+    @njit(cache=True)
+    def jaccard_u64(a_sorted, b_sorted):
+        # Merge-style two-pointer walk over two sorted, de-duplicated arrays.
+        i = 0
+        j = 0
+        shared = 0
+        while i < a_sorted.shape[0] and j < b_sorted.shape[0]:
+            if a_sorted[i] == b_sorted[j]:
+                shared += 1
+                i += 1
+                j += 1
+            elif a_sorted[i] < b_sorted[j]:
+                i += 1
+            else:
+                j += 1
+        union = a_sorted.shape[0] + b_sorted.shape[0] - shared
+        if union == 0:
+            return 1.0
+        return shared / union
+
+    def hash_blocks(blocks: Sequence[str]) -> list[int]:
+        """Hash each block of text to a 64-bit integer."""
+        encoded = [block.encode("utf-8") for block in blocks]
+        lengths = np.fromiter((len(chunk) for chunk in encoded), dtype=np.int32, count=len(encoded))
+        buf = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return block_fnv64(buf, lengths).tolist()
+
+    def block_jaccard(a: Sequence[int], b: Sequence[int]) -> float:
+        """Jaccard overlap of two collections of block hashes."""
+        return float(
+            jaccard_u64(np.unique(np.asarray(a, dtype=np.uint64)), np.unique(np.asarray(b, dtype=np.uint64)))
+        )
+
+else:
+    hash_blocks = _hash_blocks_py
+    block_jaccard = _block_jaccard_py
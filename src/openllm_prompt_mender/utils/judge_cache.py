@@ -0,0 +1,213 @@
+# Copyright (c) 2025 Loong Ma
+# SPDX-License-Identifier: MIT
+
+"""Persistent cache of LLM-judge verdicts.
+
+Optimizers re-score the same inputs many times across candidate prompts; caching the parsed scores and rationale
+per ``sha256(model | inputs...)`` lets repeat evaluations skip the judge call entirely. The ``sessions`` table keeps
+the last full verdict per requirement so a template that only changed at its tail can be judged incrementally
+against it, and ``incremental`` pins every verdict produced in that mode to its template.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+
+import dspy
+
+DEFAULT_CACHE_DIR = Path("data/cache")
+# Bump whenever a table layout or stored value format changes; it is part of the db filename, so caches written
+# by an older layout are simply left behind instead of failing at query time.
+SCHEMA_VERSION = 3
+
+
+@functools.lru_cache(maxsize=100_000)
+def judge_key(model: str, *fields: str) -> str:
+    """Return the cache key for a judge call on ``fields`` with ``model``.
+
+    Memoised because MIPROv2 re-scores the same pairs many times within a run and hashing long templates adds up.
+    """
+    return hashlib.sha256("|".join((model, *fields)).encode("utf-8")).hexdigest()
+
+
+def is_deterministic(lm: dspy.LM) -> bool:
+    """Only judges sampled at temperature 0 give verdicts worth reusing.
+
+    An unset temperature means the provider default (1.0 for OpenAI), so it does not count.
+    """
+    return lm.kwargs.get("temperature") == 0
+
+
+def judge_fingerprint(judge: dspy.Module) -> str:
+    """Hash the instructions and fields of every predictor in ``judge``.
+
+    Folded into cache keys so stored verdicts go stale as soon as the judge signature changes.
+    """
+    parts = []
+    for name, predictor in judge.named_predictors():
+        signature = predictor.signature
+        if signature is None:
+            continue
+        fields = {
+            field_name: [str(info.annotation), info.json_schema_extra]
+            for field_name, info in signature.fields.items()
+        }
+        parts.append({"predictor": name, "instructions": signature.instructions, "fields": fields})
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+class JudgeCache:
+    """Thread-safe sqlite store mapping judge keys to ``(scores, rationale)``."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS judgements (key TEXT PRIMARY KEY, scores BLOB, rationale TEXT)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions "
+                "(key TEXT PRIMARY KEY, block_hashes TEXT, scores BLOB, rationale TEXT)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS incremental (key TEXT PRIMARY KEY, scores BLOB, rationale TEXT)"
+            )
+
+    @classmethod
+    def for_model(cls, model: str, cache_dir: str | Path = DEFAULT_CACHE_DIR) -> JudgeCache:
+        """Open the cache file ``judge_{model}.v{SCHEMA_VERSION}.db`` under ``cache_dir``."""
+        safe_model = re.sub(r"[^A-Za-z0-9._-]+", "_", model)
+        return cls(Path(cache_dir) / f"judge_{safe_model}.v{SCHEMA_VERSION}.db")
+
+    def get(self, key: str) -> tuple[list[float], str] | None:
+        with self._lock:
+            row = self._conn.execute("SELECT scores, rationale FROM judgements WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, scores: Sequence[float], rationale: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO judgements (key, scores, rationale) VALUES (?, ?, ?)",
+                (key, json.dumps(list(scores)), rationale),
+            )
+
+    def get_incremental(self, key: str) -> tuple[list[float], str] | None:
+        """Return the verdict incremental judging settled on for the template behind ``key``."""
+        with self._lock:
+            row = self._conn.execute("SELECT scores, rationale FROM incremental WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set_incremental(self, key: str, scores: Sequence[float], rationale: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO incremental (key, scores, rationale) VALUES (?, ?, ?)",
+                (key, json.dumps(list(scores)), rationale),
+            )
+
+    def get_session(self, key: str) -> tuple[list[int], list[float], str] | None:
+        """Return the block hashes, scores and rationale of the last template fully judged under session ``key``."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT block_hashes, scores, rationale FROM sessions WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), json.loads(row[1]), row[2]
+
+    def set_session(self, key: str, block_hashes: Sequence[int], scores: Sequence[float], rationale: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (key, block_hashes, scores, rationale) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(list(block_hashes)), json.dumps(list(scores)), rationale),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class VerdictStore:
+    """Exact-match verdict lookups for one judge, shared by the sync, async and batch judge paths.
+
+    Lookups are keyed by ``judge_key(model, judge_fingerprint(judge), *fields)`` and are active only when a cache
+    is given and the judge is deterministic; otherwise every method is a no-op. Rows whose score count differs
+    from ``num_scores`` are treated as misses.
+    """
+
+    def __init__(
+        self,
+        judge_lm: dspy.LM,
+        judge: dspy.Module,
+        cache: JudgeCache | None,
+        num_scores: int | None = None,
+    ):
+        self.model = judge_lm.model
+        self.fingerprint = judge_fingerprint(judge)
+        self.num_scores = num_scores
+        self.cache = cache if cache is not None and is_deterministic(judge_lm) else None
+
+    def key(self, *fields: str) -> str:
+        return judge_key(self.model, self.fingerprint, *fields)
+
+    def get(self, *fields: str) -> tuple[list[float], str] | None:
+        if self.cache is None:
+            return None
+        verdict = self.cache.get(self.key(*fields))
+        if verdict is None or (self.num_scores is not None and len(verdict[0]) != self.num_scores):
+            return None
+        return verdict
+
+    def set(self, fields: Sequence[str], scores: Sequence[float], rationale: str) -> None:
+        if self.cache is not None:
+            self.cache.set(self.key(*fields), scores, rationale)
+
+
+def split_blocks(text: str) -> list[str]:
+    """Split a template into its blank-line separated blocks."""
+    return [block for block in text.split("\n\n") if block.strip()]
+
+
+def block_hashes(blocks: Sequence[str]) -> list[int]:
+    """Return the 64-bit FNV-1a hash of each block (Numba-compiled when available)."""
+    # Imported lazily so the exact-match cache never pays for compiling the incremental-judging kernels.
+    from openllm_prompt_mender.utils.jit_blocks import hash_blocks
+
+    return hash_blocks(blocks)
+
+
+def delta_prefix(previous: Sequence[int], current: Sequence[int], threshold: float) -> int | None:
+    """Return how many leading blocks of ``current`` can reuse the previous verdict, or None for a full judge.
+
+    The incremental path applies only when the block sets overlap by at least ``threshold`` and every shared
+    block sits in the common prefix, i.e. the edit is confined to the tail of the template.
+    """
+    from openllm_prompt_mender.utils.jit_blocks import block_jaccard
+
+    if not previous or not current or block_jaccard(previous, current) < threshold:
+        return None
+
+    prefix = 0
+    for old, new in zip(previous, current, strict=False):
+        if old != new:
+            break
+        prefix += 1
+
+    if prefix == 0 or set(previous[prefix:]) & set(current[prefix:]):
+        return None
+    if prefix == len(current) and len(previous) > len(current):
+        return None
+    return prefix
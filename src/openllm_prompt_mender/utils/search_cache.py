@@ -0,0 +1,57 @@
+# Copyright (c) 2025 Loong Ma
+# SPDX-License-Identifier: MIT
+
+"""Persistent cache of paid web-search results, so repeated trainset builds only hit the API for new queries."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+
+from openllm_prompt_mender.utils.data_utils import dump_json_bytes, load_json_bytes
+from openllm_prompt_mender.utils.judge_cache import DEFAULT_CACHE_DIR
+
+DEFAULT_SEARCH_CACHE_PATH = DEFAULT_CACHE_DIR / "search.db"
+
+
+def search_key(question: str, num_results: int) -> str:
+    return hashlib.sha256(f"{question}|{num_results}".encode()).hexdigest()
+
+
+class SearchCache:
+    """Thread-safe sqlite store of search snippets with an in-process memo in front of it."""
+
+    def __init__(self, path: str | Path = DEFAULT_SEARCH_CACHE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._memo: dict[str, list[str]] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS search_cache (key TEXT PRIMARY KEY, results_json BLOB)")
+
+    def get(self, question: str, num_results: int) -> list[str] | None:
+        key = search_key(question, num_results)
+        if key in self._memo:
+            return self._memo[key]
+        with self._lock:
+            row = self._conn.execute("SELECT results_json FROM search_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._memo[key] = load_json_bytes(row[0])
+        return self._memo[key]
+
+    def set(self, question: str, num_results: int, snippets: list[str]) -> None:
+        key = search_key(question, num_results)
+        self._memo[key] = snippets
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, results_json) VALUES (?, ?)",
+                (key, dump_json_bytes(snippets)),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
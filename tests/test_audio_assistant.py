@@ -0,0 +1,136 @@
+# Copyright (c) 2025 Loong Ma
+# SPDX-License-Identifier: MIT
+
+"""Tests for the judge metrics in `openllm_prompt_mender.apps.audio_assistant`."""
+
+import asyncio
+
+import dspy
+import pytest
+
+from openllm_prompt_mender.apps import audio_assistant
+from openllm_prompt_mender.utils.judge_cache import JudgeCache
+
+BASE_TEMPLATE = "\n\n".join(f"Section {index}" for index in range(10))
+
+
+class StubJudge(dspy.Module):
+    """Full judge that scores every criterion ``score`` and records each call."""
+
+    def __init__(self, score: float = 0.5):
+        super().__init__()
+        self.predict = dspy.Predict(audio_assistant.AssessTemplateQuality)
+        self.score = score
+        self.calls = []
+
+    def forward(self, requirements, template):
+        self.calls.append(template)
+        return dspy.Prediction(rationale="full", **dict.fromkeys(audio_assistant.SCORE_FIELDS, self.score))
+
+    async def aforward(self, requirements, template):
+        return self.forward(requirements, template)
+
+
+class StubDeltaJudge(dspy.Module):
+    """Delta judge that moves every criterion by ``delta`` and records the scores it was anchored to."""
+
+    def __init__(self, delta: float = 0.1):
+        super().__init__()
+        self.predict = dspy.Predict(audio_assistant.AssessTemplateQualityDelta)
+        self.delta = delta
+        self.calls = []
+
+    def forward(self, requirements, previous_verdict, previous_scores, new_template_tail):
+        self.calls.append((previous_scores, new_template_tail))
+        return dspy.Prediction(rationale="delta", score_deltas=dict.fromkeys(audio_assistant.SCORE_FIELDS, self.delta))
+
+    async def aforward(self, **kwargs):
+        return self.forward(**kwargs)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    judge_cache = JudgeCache(tmp_path / "judge.db")
+    yield judge_cache
+    judge_cache.close()
+
+
+def score(metric, template, requirements="Weekly sync notes"):
+    return metric(dspy.Example(requirements=requirements), dspy.Prediction(template=template)).score
+
+
+def test_incremental_full_delta_pinned_and_anchor(cache):
+    judge, delta_judge = StubJudge(), StubDeltaJudge()
+    metric = audio_assistant.build_llm_judge_metric(
+        dspy.LM("openai/judge"), judge, cache=cache, delta_judge=delta_judge, incr_threshold=0.5
+    )
+    edited = BASE_TEMPLATE + "\n\nTail A"
+
+    assert score(metric, BASE_TEMPLATE) == pytest.approx(0.5)
+    assert score(metric, edited) == pytest.approx(0.6)
+    assert [tail for _, tail in delta_judge.calls] == ["Tail A"]
+
+    # A second edit is judged against the full verdict, not the previous delta.
+    assert score(metric, BASE_TEMPLATE + "\n\nTail B") == pytest.approx(0.6)
+    assert delta_judge.calls[-1][0] == dict.fromkeys(audio_assistant.SCORE_FIELDS, 0.5)
+
+    # Re-scoring the edited template returns its pinned score, and the base template reuses the anchor.
+    assert score(metric, edited) == pytest.approx(0.6)
+    assert score(metric, BASE_TEMPLATE) == pytest.approx(0.5)
+    assert judge.calls == [BASE_TEMPLATE]
+    assert len(delta_judge.calls) == 2
+
+
+def test_incremental_pins_survive_a_new_metric(cache):
+    lm = dspy.LM("openai/judge")
+    edited = BASE_TEMPLATE + "\n\nTail A"
+    first = audio_assistant.build_llm_judge_metric(lm, StubJudge(), cache=cache, delta_judge=StubDeltaJudge())
+    score(first, BASE_TEMPLATE)
+    score(first, edited)
+
+    judge, delta_judge = StubJudge(score=0.9), StubDeltaJudge(delta=-0.3)
+    second = audio_assistant.build_llm_judge_metric(lm, judge, cache=cache, delta_judge=delta_judge)
+    assert score(second, edited) == pytest.approx(0.6)
+    assert judge.calls == []
+    assert delta_judge.calls == []
+
+
+def test_unrelated_template_gets_full_judge(cache):
+    judge, delta_judge = StubJudge(), StubDeltaJudge()
+    metric = audio_assistant.build_llm_judge_metric(
+        dspy.LM("openai/judge"), judge, cache=cache, delta_judge=delta_judge
+    )
+    score(metric, BASE_TEMPLATE)
+    score(metric, "Something else entirely")
+    assert len(judge.calls) == 2
+    assert delta_judge.calls == []
+
+
+def test_exact_cache_only_for_temperature_zero(cache):
+    sampled = StubJudge()
+    metric = audio_assistant.build_llm_judge_metric(dspy.LM("openai/judge"), sampled, cache=cache)
+    score(metric, BASE_TEMPLATE)
+    score(metric, BASE_TEMPLATE)
+    assert len(sampled.calls) == 2
+
+    greedy = StubJudge()
+    metric = audio_assistant.build_llm_judge_metric(dspy.LM("openai/judge", temperature=0), greedy, cache=cache)
+    score(metric, BASE_TEMPLATE)
+    score(metric, BASE_TEMPLATE)
+    assert len(greedy.calls) == 1
+
+
+def test_async_metric_matches_sync(cache):
+    delta_judge = StubDeltaJudge()
+    metric = audio_assistant.build_async_llm_judge_metric(
+        dspy.LM("openai/judge"), StubJudge(), cache=cache, delta_judge=delta_judge, incr_threshold=0.5
+    )
+
+    async def run():
+        example = dspy.Example(requirements="Weekly sync notes")
+        first = await metric(example, dspy.Prediction(template=BASE_TEMPLATE))
+        second = await metric(example, dspy.Prediction(template=BASE_TEMPLATE + "\n\nTail A"))
+        return first.score, second.score
+
+    assert asyncio.run(run()) == pytest.approx((0.5, 0.6))
+    assert len(delta_judge.calls) == 1
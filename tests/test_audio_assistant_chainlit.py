@@ -0,0 +1,34 @@
+# Copyright (c) 2025 Loong Ma
+# SPDX-License-Identifier: MIT
+
+"""Tests for `openllm_prompt_mender.apps.audio_assistant_chainlit`."""
+
+import asyncio
+import os
+
+from openllm_prompt_mender.apps import audio_assistant_chainlit
+from openllm_prompt_mender.apps.audio_assistant import VoiceMemoApp
+
+
+def test_get_program_reloads_across_tasks(tmp_path):
+    compiled_path = tmp_path / "audio_assistant.json"
+
+    async def handle_message():
+        # Each chainlit message runs in its own task, like this call.
+        return audio_assistant_chainlit.get_program(str(compiled_path))
+
+    async def run():
+        fallback = await asyncio.create_task(handle_message())
+        assert await asyncio.create_task(handle_message()) is fallback
+
+        VoiceMemoApp().save(str(compiled_path))
+        compiled = await asyncio.create_task(handle_message())
+        assert compiled is not fallback
+
+        stat = compiled_path.stat()
+        os.utime(compiled_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        recompiled = await asyncio.create_task(handle_message())
+        assert recompiled is not compiled
+        assert await asyncio.create_task(handle_message()) is recompiled
+
+    asyncio.run(run())
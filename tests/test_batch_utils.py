@@ -0,0 +1,99 @@
+# Copyright (c) 2025 Loong Ma
+# SPDX-License-Identifier: MIT
+
+"""Tests for `openllm_prompt_mender.utils.batch_utils`."""
+
+from types import SimpleNamespace
+
+import dspy
+import pytest
+
+from openllm_prompt_mender.utils import batch_utils
+from openllm_prompt_mender.utils.judge_cache import JudgeCache
+
+
+class AssessAnswer(dspy.Signature):
+    """Assess an answer."""
+
+    answer = dspy.InputField()
+    score = dspy.OutputField()
+
+
+class FakeBatch:
+    """Stands in for ``batch_predict``: fails the inputs listed in ``fail`` and records every job."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.jobs = []
+
+    def __call__(self, module, lm, inputs, **kwargs):
+        self.jobs.append([example_inputs["answer"] for example_inputs in inputs])
+        return [
+            None if example_inputs["answer"] in self.fail else dspy.Prediction(score=0.5, rationale="ok")
+            for example_inputs in inputs
+        ]
+
+
+def make_scorer(cache, temperature=0):
+    return batch_utils.build_batch_scorer(
+        dspy.LM("openai/judge", temperature=temperature),
+        dspy.Predict(AssessAnswer),
+        lambda example, pred: {"answer": pred.answer},
+        lambda assessment: [float(assessment.score)],
+        lambda scores, rationale: dspy.Prediction(score=scores[0], feedback=rationale),
+        cache=cache,
+        num_scores=1,
+    )
+
+
+def score(scorer, answers):
+    preds = [dspy.Prediction(answer=answer) for answer in answers]
+    return [result.score for result in scorer([dspy.Example()] * len(answers), preds)]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    judge_cache = JudgeCache(tmp_path / "judge.db")
+    yield judge_cache
+    judge_cache.close()
+
+
+def test_batch_scorer_skips_cached_pairs(cache, monkeypatch):
+    fake = FakeBatch()
+    monkeypatch.setattr(batch_utils, "batch_predict", fake)
+    scorer = make_scorer(cache)
+    assert score(scorer, ["a", "b"]) == [0.5, 0.5]
+    assert score(scorer, ["b", "c", "a"]) == [0.5, 0.5, 0.5]
+    assert fake.jobs == [["a", "b"], ["c"]]
+
+
+def test_batch_scorer_scores_failures_as_zero_and_retries_them(cache, monkeypatch):
+    fake = FakeBatch(fail={"b"})
+    monkeypatch.setattr(batch_utils, "batch_predict", fake)
+    scorer = make_scorer(cache)
+    assert score(scorer, ["a", "b"]) == [0.5, 0.0]
+    assert score(scorer, ["a", "b"]) == [0.5, 0.0]
+    assert fake.jobs == [["a", "b"], ["b"]]
+
+
+def test_batch_scorer_without_deterministic_judge_resends(cache, monkeypatch):
+    fake = FakeBatch()
+    monkeypatch.setattr(batch_utils, "batch_predict", fake)
+    scorer = make_scorer(cache, temperature=None)
+    score(scorer, ["a"])
+    score(scorer, ["a"])
+    assert fake.jobs == [["a"], ["a"]]
+
+
+def test_batch_predict_times_out_and_cancels(monkeypatch):
+    litellm = pytest.importorskip("litellm")
+    cancelled = []
+    monkeypatch.setattr(litellm, "create_file", lambda **kwargs: SimpleNamespace(id="file-1"))
+    monkeypatch.setattr(litellm, "create_batch", lambda **kwargs: SimpleNamespace(id="batch-1", status="in_progress"))
+    monkeypatch.setattr(litellm, "cancel_batch", lambda batch_id, **kwargs: cancelled.append(batch_id))
+
+    with pytest.raises(TimeoutError, match="batch-1"):
+        batch_utils.batch_predict(
+            dspy.Predict(AssessAnswer), dspy.LM("openai/judge"), [{"answer": "a"}], poll_interval=0, timeout=0
+        )
+    assert cancelled == ["batch-1"]
@@ -0,0 +1,59 @@
+# Copyright (c) 2025 Loong Ma
+# SPDX-License-Identifier: MIT
+
+"""Tests for `openllm_prompt_mender.utils.data_utils`."""
+
+import dspy
+import pytest
+
+from openllm_prompt_mender.utils.data_utils import (
+    load_trainset,
+    load_trainset_chunks,
+    load_trainset_iter,
+    load_trainset_wds,
+    save_trainset,
+    save_trainset_wds,
+)
+
+
+@pytest.fixture
+def trainset_path(tmp_path):
+    trainset = [dspy.Example(question=f"q{i}", context=f"上下文 {i}", answer=f"a{i}") for i in range(5)]
+    path = tmp_path / "trainset.jsonl"
+    save_trainset(trainset, str(path))
+    return path
+
+
+def test_save_trainset_writes_one_line_per_example(trainset_path):
+    assert len(trainset_path.read_bytes().splitlines()) == 5
+
+
+def test_load_trainset_iter_keeps_order_and_inputs(trainset_path):
+    examples = list(load_trainset_iter(str(trainset_path)))
+    assert [example.question for example in examples] == [f"q{i}" for i in range(5)]
+    assert examples[0].context == "上下文 0"
+    assert set(examples[0].inputs().keys()) == {"question", "context"}
+
+
+def test_load_trainset_round_trip(trainset_path):
+    examples = load_trainset(str(trainset_path), input_keys=("question",))
+    assert sorted(example.question for example in examples) == [f"q{i}" for i in range(5)]
+    assert set(examples[0].inputs().keys()) == {"question"}
+
+
+def test_load_trainset_chunks(trainset_path):
+    chunks = list(load_trainset_chunks(str(trainset_path), chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert [example.question for chunk in chunks for example in chunk] == [f"q{i}" for i in range(5)]
+
+
+def test_webdataset_round_trip(tmp_path):
+    pytest.importorskip("webdataset")
+    trainset = [dspy.Example(question=f"q{i}", context=f"上下文 {i}") for i in range(5)]
+    save_trainset_wds(trainset, str(tmp_path / "trainset-%06d.tar"), shard_size=2)
+
+    shards = sorted(str(path) for path in tmp_path.glob("trainset-*.tar"))
+    assert len(shards) == 3
+    examples = list(load_trainset_wds(shards))
+    assert [example.toDict() for example in examples] == [example.toDict() for example in trainset]
+    assert set(examples[0].inputs().keys()) == {"question", "context"}
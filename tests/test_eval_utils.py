@@ -0,0 +1,62 @@
+# Copyright (c) 2025 Loong Ma
+# SPDX-License-Identifier: MIT
+
+"""Tests for `openllm_prompt_mender.utils.eval_utils`."""
+
+import asyncio
+
+import dspy
+
+from openllm_prompt_mender.utils.eval_utils import async_scorer, run_eval
+
+
+class TrackingMetric:
+    """Async metric that records peak concurrency and fails on the examples listed in ``fail_on``."""
+
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, example, pred, trace=None):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if example.index in self.fail_on:
+            msg = f"judge exploded on {example.index}"
+            raise ValueError(msg)
+        return dspy.Prediction(score=1.0, feedback="ok")
+
+
+def make_pairs(count):
+    return [dspy.Example(index=index) for index in range(count)], [dspy.Prediction() for _ in range(count)]
+
+
+def test_run_eval_limits_concurrency():
+    metric = TrackingMetric()
+    examples, preds = make_pairs(12)
+    results = asyncio.run(run_eval(metric, examples, preds, max_concurrency=3))
+    assert metric.peak == 3
+    assert [result.score for result in results] == [1.0] * 12
+
+
+def test_run_eval_scores_failures_as_zero():
+    examples, preds = make_pairs(4)
+    results = asyncio.run(run_eval(TrackingMetric(fail_on={2}), examples, preds, max_concurrency=2))
+    assert [result.score for result in results] == [1.0, 1.0, 0.0, 1.0]
+    assert "judge exploded on 2" in results[2].feedback
+
+
+def test_run_eval_defaults_to_async_max_workers():
+    metric = TrackingMetric()
+    examples, preds = make_pairs(6)
+    with dspy.context(async_max_workers=2):
+        asyncio.run(run_eval(metric, examples, preds))
+    assert metric.peak == 2
+
+
+def test_async_scorer_is_blocking():
+    examples, preds = make_pairs(3)
+    results = async_scorer(TrackingMetric(fail_on={0}))(examples, preds)
+    assert [result.score for result in results] == [0.0, 1.0, 1.0]
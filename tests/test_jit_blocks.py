@@ -0,0 +1,47 @@
+# Copyright (c) 2025 Loong Ma
+# SPDX-License-Identifier: MIT
+
+"""Tests for `openllm_prompt_mender.utils.jit_blocks`."""
+
+import pytest
+
+from openllm_prompt_mender.utils import jit_blocks
+
+HASH_IMPLS = [pytest.param(jit_blocks._hash_blocks_py, id="python")]
+JACCARD_IMPLS = [pytest.param(jit_blocks._block_jaccard_py, id="python")]
+if jit_blocks.HAS_NUMBA:
+    HASH_IMPLS.append(pytest.param(jit_blocks.hash_blocks, id="numba"))
+    JACCARD_IMPLS.append(pytest.param(jit_blocks.block_jaccard, id="numba"))
+
+
+def reference_fnv1a_64(data: bytes) -> int:
+    h = 0xCBF29CE484222325
+    for byte in data:
+        h ^= byte
+        h = (h * 0x100000001B3) % 2**64
+    return h
+
+
+@pytest.mark.parametrize("hash_blocks", HASH_IMPLS)
+def test_hash_blocks_known_vectors(hash_blocks):
+    assert hash_blocks(["", "a", "foobar"]) == [0xCBF29CE484222325, 0xAF63DC4C8601EC8C, 0x85944171F73967E8]
+
+
+@pytest.mark.parametrize("hash_blocks", HASH_IMPLS)
+def test_hash_blocks_matches_reference(hash_blocks):
+    blocks = ["# Title", "héllo wörld", "模板", "x" * 4096, "line one\nline two", ""]
+    assert hash_blocks(blocks) == [reference_fnv1a_64(block.encode("utf-8")) for block in blocks]
+
+
+@pytest.mark.parametrize("hash_blocks", HASH_IMPLS)
+def test_hash_blocks_empty(hash_blocks):
+    assert hash_blocks([]) == []
+
+
+@pytest.mark.parametrize("block_jaccard", JACCARD_IMPLS)
+def test_block_jaccard(block_jaccard):
+    assert block_jaccard([1, 2, 3], [1, 2, 3]) == 1.0
+    assert block_jaccard([1, 2], [3, 4]) == 0.0
+    assert block_jaccard([1, 2, 3, 3], [3, 4, 2]) == pytest.approx(0.5)
+    assert block_jaccard([2**64 - 1, 5], [2**64 - 1]) == pytest.approx(0.5)
+    assert block_jaccard([], []) == 1.0
@@ -0,0 +1,115 @@
+# Copyright (c) 2025 Loong Ma
+# SPDX-License-Identifier: MIT
+
+"""Tests for `openllm_prompt_mender.utils.judge_cache`."""
+
+import dspy
+import pytest
+
+from openllm_prompt_mender.utils.judge_cache import JudgeCache, VerdictStore, delta_prefix, split_blocks
+
+BASE = list(range(1, 11))
+
+
+class AssessAnswer(dspy.Signature):
+    """Assess an answer."""
+
+    answer = dspy.InputField()
+    score = dspy.OutputField()
+
+
+class AssessAnswerStrictly(dspy.Signature):
+    """Assess an answer strictly."""
+
+    answer = dspy.InputField()
+    score = dspy.OutputField()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    judge_cache = JudgeCache(tmp_path / "judge.db")
+    yield judge_cache
+    judge_cache.close()
+
+
+def test_split_blocks_drops_blank_blocks():
+    assert split_blocks("a\n\n\n\nb\n\n  \n\nc") == ["a", "b", "c"]
+
+
+def test_delta_prefix_append():
+    assert delta_prefix(BASE, [*BASE, 11], 0.8) == len(BASE)
+
+
+def test_delta_prefix_tail_edit():
+    assert delta_prefix(BASE, [*BASE[:-1], 99], 0.8) == len(BASE) - 1
+
+
+def test_delta_prefix_identical():
+    assert delta_prefix(BASE, BASE, 0.8) == len(BASE)
+
+
+def test_delta_prefix_truncate():
+    assert delta_prefix(BASE, BASE[:-1], 0.8) is None
+
+
+def test_delta_prefix_duplicate_blocks():
+    # Repeating an earlier block at the tail is still a tail-only edit.
+    assert delta_prefix(BASE, [*BASE, BASE[0]], 0.8) == len(BASE)
+    # Swapping the last two blocks keeps them but moves them, so the tail cannot be judged alone.
+    assert delta_prefix(BASE, [*BASE[:-2], BASE[-1], BASE[-2]], 0.8) is None
+
+
+def test_delta_prefix_needs_overlap_and_shared_head():
+    assert delta_prefix([], BASE, 0.8) is None
+    assert delta_prefix(BASE, [], 0.8) is None
+    assert delta_prefix(BASE, [*BASE[:5], 11, 12, 13, 14, 15], 0.8) is None
+    assert delta_prefix(BASE, [99, *BASE[1:]], 0.8) is None
+
+
+def test_judge_cache_round_trip(tmp_path):
+    judge_cache = JudgeCache(tmp_path / "judge.db")
+    judge_cache.set("key", [0.5, 1.0], "fine")
+    judge_cache.set_session("session", [1, 2**64 - 1], [0.25], "anchor")
+    judge_cache.set_incremental("template", [0.75], "delta")
+    judge_cache.close()
+
+    reopened = JudgeCache(tmp_path / "judge.db")
+    assert reopened.get("key") == ([0.5, 1.0], "fine")
+    assert reopened.get_session("session") == ([1, 2**64 - 1], [0.25], "anchor")
+    assert reopened.get_incremental("template") == ([0.75], "delta")
+    assert reopened.get("missing") is None
+    assert reopened.get_session("missing") is None
+    assert reopened.get_incremental("missing") is None
+    reopened.close()
+
+
+def test_for_model_sanitises_and_versions_filename(tmp_path):
+    judge_cache = JudgeCache.for_model("openai/gpt-5-mini", cache_dir=tmp_path)
+    assert judge_cache.path.parent == tmp_path
+    assert judge_cache.path.name.startswith("judge_openai_gpt-5-mini.v")
+    judge_cache.close()
+
+
+def test_verdict_store_needs_temperature_zero(cache):
+    judge = dspy.Predict(AssessAnswer)
+    sampled = VerdictStore(dspy.LM("openai/judge"), judge, cache)
+    sampled.set(("answer",), [1.0], "ok")
+    assert sampled.get("answer") is None
+
+    greedy = VerdictStore(dspy.LM("openai/judge", temperature=0), judge, cache)
+    greedy.set(("answer",), [1.0], "ok")
+    assert greedy.get("answer") == ([1.0], "ok")
+
+
+def test_verdict_store_keys_on_judge_signature(cache):
+    lm = dspy.LM("openai/judge", temperature=0)
+    VerdictStore(lm, dspy.Predict(AssessAnswer), cache).set(("answer",), [1.0], "ok")
+    assert VerdictStore(lm, dspy.Predict(AssessAnswerStrictly), cache).get("answer") is None
+
+
+def test_verdict_store_rejects_wrong_score_count(cache):
+    lm = dspy.LM("openai/judge", temperature=0)
+    judge = dspy.Predict(AssessAnswer)
+    VerdictStore(lm, judge, cache).set(("answer",), [1.0, 0.0], "ok")
+    assert VerdictStore(lm, judge, cache, num_scores=3).get("answer") is None
+    assert VerdictStore(lm, judge, cache, num_scores=2).get("answer") == ([1.0, 0.0], "ok")
@@ -0,0 +1,12 @@
+# Copyright (c) 2025 Loong Ma
+# SPDX-License-Identifier: MIT
+
+"""Tests for `openllm_prompt_mender.optimizers.optimize_search_assistant`."""
+
+from openllm_prompt_mender.optimizers.optimize_search_assistant import load_queries
+
+
+def test_load_queries_skips_blank_lines(tmp_path):
+    path = tmp_path / "queries.jsonl"
+    path.write_text('{"query": "first"}\n\n{"query": "第二", "extra": 1}\n   \n', encoding="utf-8")
+    assert list(load_queries(path)) == ["first", "第二"]
@@ -0,0 +1,121 @@
+# Copyright (c) 2025 Loong Ma
+# SPDX-License-Identifier: MIT
+
+"""Tests for `openllm_prompt_mender.apps.search_assistant`."""
+
+import asyncio
+from typing import cast
+
+import aiohttp
+import pytest
+
+from openllm_prompt_mender.apps import search_assistant
+from openllm_prompt_mender.utils.judge_cache import is_deterministic
+from openllm_prompt_mender.utils.search_cache import SearchCache
+
+
+def test_default_judge_is_cacheable():
+    judge_lm, _ = search_assistant.make_judge()
+    assert is_deterministic(judge_lm)
+    sampled_lm, _ = search_assistant.make_judge(temperature=None)
+    assert not is_deterministic(sampled_lm)
+
+
+def test_warm_cache_builds_without_credentials(tmp_path, monkeypatch):
+    monkeypatch.delenv("GOOGLE_CSE_API_KEY", raising=False)
+    monkeypatch.delenv("GOOGLE_CSE_CX", raising=False)
+    cache = SearchCache(tmp_path / "search.db")
+    cache.set("what is dspy", 3, ["first", "second", "third"])
+
+    trainset = search_assistant.build_trainset(["what is dspy"], min_results=2, max_results=3, cache=cache)
+    assert [example.question for example in trainset] == ["what is dspy"]
+    assert trainset[0].context in {"1. first\n2. second", "1. first\n2. second\n3. third"}
+    cache.close()
+
+
+def test_cache_miss_needs_credentials(tmp_path, monkeypatch):
+    monkeypatch.delenv("GOOGLE_CSE_API_KEY", raising=False)
+    monkeypatch.delenv("GOOGLE_CSE_CX", raising=False)
+    cache = SearchCache(tmp_path / "search.db")
+    with pytest.raises(RuntimeError, match="GOOGLE_CSE_API_KEY"):
+        search_assistant.build_trainset(["never searched"], cache=cache)
+    cache.close()
+
+
+class FakeResponse:
+    def __init__(self, status, payload=None):
+        self.status = status
+        self.payload = payload or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise RuntimeError(self.status)
+
+    async def json(self):
+        return self.payload
+
+
+class FakeSession:
+    """Replays ``statuses`` in order, answering the final 200 with two snippets."""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    def get(self, url, params):
+        self.calls += 1
+        status = self.statuses.pop(0)
+        return FakeResponse(status, {"items": [{"snippet": "one"}, {"snippet": "two"}]})
+
+
+def test_search_snippets_backs_off_on_rate_limit(monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(search_assistant.asyncio, "sleep", fake_sleep)
+    session = FakeSession([429, 429, 200])
+    client = cast(aiohttp.ClientSession, session)
+    snippets = asyncio.run(search_assistant._search_snippets(client, asyncio.Semaphore(1), {"q": "dspy"}))
+    assert snippets == ["one", "two"]
+    assert delays == [1, 2]
+    assert session.calls == 3
+
+
+def test_search_snippets_gives_up_after_max_retries(monkeypatch):
+    async def fake_sleep(delay):
+        pass
+
+    monkeypatch.setattr(search_assistant.asyncio, "sleep", fake_sleep)
+    session = FakeSession([429] * 3)
+    client = cast(aiohttp.ClientSession, session)
+    with pytest.raises(RuntimeError, match="rate limiting"):
+        asyncio.run(search_assistant._search_snippets(client, asyncio.Semaphore(1), {"q": "dspy"}, max_retries=3))
+    assert session.calls == 3
+
+
+def test_build_trainset_fetches_misses_once_and_caches_them(tmp_path, monkeypatch):
+    monkeypatch.setenv("GOOGLE_CSE_API_KEY", "key")
+    monkeypatch.setenv("GOOGLE_CSE_CX", "cx")
+    searched = []
+
+    async def fake_search(session, semaphore, params, max_retries=5):
+        searched.append(params["q"])
+        return [f"{params['q']} snippet"]
+
+    monkeypatch.setattr(search_assistant, "_search_snippets", fake_search)
+    cache = SearchCache(tmp_path / "search.db")
+    cache.set("cached", 10, ["cached snippet"])
+
+    trainset = search_assistant.build_trainset(["cached", "fresh", "fresh"], cache=cache)
+    assert [example.context for example in trainset] == ["1. cached snippet", "1. fresh snippet", "1. fresh snippet"]
+    assert searched == ["fresh"]
+    assert cache.get("fresh", 10) == ["fresh snippet"]
+    cache.close()
@@ -0,0 +1,19 @@
+# Copyright (c) 2025 Loong Ma
+# SPDX-License-Identifier: MIT
+
+"""Tests for `openllm_prompt_mender.utils.search_cache`."""
+
+from openllm_prompt_mender.utils.search_cache import SearchCache
+
+
+def test_search_cache_round_trip(tmp_path):
+    cache = SearchCache(tmp_path / "search.db")
+    assert cache.get("what is dspy", 10) is None
+    cache.set("what is dspy", 10, ["snippet one", "片段二"])
+    assert cache.get("what is dspy", 10) == ["snippet one", "片段二"]
+    assert cache.get("what is dspy", 5) is None
+    cache.close()
+
+    reopened = SearchCache(tmp_path / "search.db")
+    assert reopened.get("what is dspy", 10) == ["snippet one", "片段二"]
+    reopened.close()